@@ -1,6 +1,10 @@
 from dataclasses import dataclass
+from operator import attrgetter
+from typing import List
 
-@dataclass
+import numpy as np
+
+@dataclass(slots=True)
 class Alternative:
     """
     A class to characterize a travel alternative to a specific destination.
@@ -18,3 +22,173 @@ class Alternative:
     distance: float
     time: float
     energy_demand: float
+
+    @classmethod
+    def from_columns(cls, destinations, modes, distances, times,
+                     energy_demands) -> 'AlternativeArray':
+        """
+        Build an AlternativeArray from per-attribute columns.
+
+        Args:
+            destinations: Destination names, one per alternative.
+            modes: Transport mode names, one per alternative.
+            distances: Distances [km], one per alternative.
+            times: Travel times [minutes], one per alternative.
+            energy_demands: Final energy demands [kJ], one per alternative.
+
+        Returns:
+            AlternativeArray: Columnar storage of the given alternatives.
+        """
+        return AlternativeArray(destinations, modes, distances, times,
+                                energy_demands)
+
+
+class AlternativeArray:
+    """
+    Columnar (structure-of-arrays) storage of many alternatives.
+
+    Instead of one Python object with five attributes per alternative, the five
+    attributes are stored as five contiguous numpy arrays. For large numbers of
+    alternatives this cuts per-object memory overhead by an order of magnitude
+    and lets destination and mode filters run as vectorized comparisons.
+    Individual Alternative objects are materialized on demand via indexing, so
+    only the alternatives actually consulted pay the object cost.
+
+    The columns are sorted by destination on construction, so the candidates
+    for a destination form one contiguous slice found by binary search, rather
+    than a full-column scan per lookup.
+
+    Attributes:
+        destination (np.ndarray): The destination of each alternative.
+        mode (np.ndarray): The transport mode of each alternative.
+        distance (np.ndarray): The distance [km] of each alternative.
+        time (np.ndarray): The travel time [minutes] of each alternative.
+        energy_demand (np.ndarray): The energy demand [kJ] of each alternative.
+    """
+
+    __slots__ = ('destination', 'mode', 'distance', 'time', 'energy_demand')
+
+    def __init__(self, destinations, modes, distances, times, energy_demands):
+        """
+        Store the given columns as numpy arrays.
+
+        Args:
+            destinations: Destination names, one per alternative.
+            modes: Transport mode names, one per alternative.
+            distances: Distances [km], one per alternative.
+            times: Travel times [minutes], one per alternative.
+            energy_demands: Final energy demands [kJ], one per alternative.
+        """
+        # Sort all columns by destination (stable, so the relative order of an
+        # input's alternatives is preserved within each destination); lookups
+        # then reduce to a binary search plus a contiguous slice
+        destinations = np.asarray(destinations)
+        order = np.argsort(destinations, kind='stable')
+        self.destination = destinations[order]
+        self.mode = np.asarray(modes)[order]
+        self.distance = np.asarray(distances, dtype=float)[order]
+        self.time = np.asarray(times, dtype=float)[order]
+        self.energy_demand = np.asarray(energy_demands, dtype=float)[order]
+
+    def __len__(self) -> int:
+        return len(self.destination)
+
+    def __getitem__(self, i: int) -> 'Alternative':
+        """
+        Materialize the alternative at position i as an Alternative object.
+
+        Args:
+            i (int): Position in the columns.
+
+        Returns:
+            Alternative: The alternative at that position.
+        """
+        return Alternative(self.destination[i].item(), self.mode[i].item(),
+                           self.distance[i].item(), self.time[i].item(),
+                           self.energy_demand[i].item())
+
+    def candidates(self, destination: str, modes_unavailable=()) -> np.ndarray:
+        """
+        Get the positions of alternatives matching a destination and mode filter.
+
+        Args:
+            destination (str): The destination to look up.
+            modes_unavailable: Mode names that are not available.
+
+        Returns:
+            np.ndarray: Positions whose destination matches and whose mode is
+                        available. The destination slice is located by binary
+                        search in the sorted destination column; only its modes
+                        are compared.
+        """
+        lo = np.searchsorted(self.destination, destination, side='left')
+        hi = np.searchsorted(self.destination, destination, side='right')
+        idx = np.arange(lo, hi, dtype=np.intp)
+        if modes_unavailable:
+            idx = idx[~np.isin(self.mode[lo:hi], list(modes_unavailable))]
+        return idx
+
+
+class AlternativeIndex:
+    """
+    An index over a list of alternatives for fast repeated filtering.
+
+    Build the index once and share it across personas: the candidates for a
+    destination are precomputed integer positions, and mode availability is a
+    boolean mask combined with one bitwise operation per unavailable mode,
+    instead of re-scanning the full list for every destination.
+
+    Attributes:
+        alternatives (List[Alternative]): The indexed alternatives.
+        dest_to_idx (dict): Maps each destination to an integer array of
+                            positions in the alternatives list.
+        mode_masks (dict): Maps each mode to a boolean mask over the
+                           alternatives list.
+    """
+
+    def __init__(self, alternatives: List['Alternative']):
+        """
+        Build the index.
+
+        Args:
+            alternatives (List[Alternative]): A list of Alternative objects.
+        """
+        self.alternatives = list(alternatives)
+
+        # attrgetter loads both attributes in one C-level call per alternative,
+        # and a single pass fills the destination buckets and the mode list
+        get_dest_mode = attrgetter('destination', 'mode')
+        positions = {}
+        modes = []
+        for i, alt in enumerate(self.alternatives):
+            dest, mode = get_dest_mode(alt)
+            positions.setdefault(dest, []).append(i)
+            modes.append(mode)
+
+        self.dest_to_idx = {dest: np.array(idx, dtype=np.intp)
+                            for dest, idx in positions.items()}
+
+        modes = np.array(modes)
+        self.mode_masks = {mode: modes == mode for mode in set(modes.tolist())}
+
+    def candidates(self, destination: str, modes_unavailable=()) -> np.ndarray:
+        """
+        Get the positions of alternatives matching a destination and mode filter.
+
+        Args:
+            destination (str): The destination to look up.
+            modes_unavailable: Mode names that are not available.
+
+        Returns:
+            np.ndarray: Positions in the alternatives list whose destination
+                        matches and whose mode is available.
+        """
+        idx = self.dest_to_idx.get(destination)
+        if idx is None:
+            return np.empty(0, dtype=np.intp)
+        mask = np.ones(len(idx), dtype=bool)
+        for mode in modes_unavailable:
+            mode_mask = self.mode_masks.get(mode)
+            if mode_mask is not None:
+                mask &= ~mode_mask[idx]
+        return idx[mask]
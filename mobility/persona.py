@@ -1,9 +1,10 @@
-import random
 from typing import Dict, List
-#from scipy.optimize import milp, Bounds, LinearConstraint
-#import numpy as np
+import numpy as np
 
-from alternative import Alternative
+from alternative import Alternative, AlternativeArray, AlternativeIndex
+
+# Shared random number generator for alternative selection
+_rng = np.random.default_rng()
 
 class Persona:
     """
@@ -76,7 +77,12 @@ class Persona:
         Certain modes can be marked unavailable and won't be chosen.
 
         Args:
-            alternatives (List[Alternative]): A list of Alternative objects.
+            alternatives: A list of Alternative objects, an AlternativeIndex
+                          built from one, an AlternativeArray in columnar form,
+                          or a dict mapping each destination to its
+                          alternatives. Pass an index, array or pre-bucketed
+                          dict to reuse the destination lookup across many
+                          personas.
             method (str): "random" chooses alternatives randomly.
                           "min_energy_typ_time" minimizes energy demand while not diverging
                           more than 10 minutes from the persona's typical travel time.
@@ -86,20 +92,54 @@ class Persona:
             ValueError: If there is not a single alternative for a specific key in the persona's trips dict.
         """
 
+        # Index the alternatives by destination and mode (or reuse a shared index,
+        # columnar array or pre-bucketed dict)
+        bucketed = isinstance(alternatives, dict)
+        columnar = isinstance(alternatives, AlternativeArray)
+        if bucketed:
+            unavailable = frozenset(modes_unavailable)
+        elif not columnar and not isinstance(alternatives, AlternativeIndex):
+            alternatives = AlternativeIndex(alternatives)
+
+        # AlternativeIndex holds the original objects; AlternativeArray
+        # materializes objects on demand by position
+        if not bucketed:
+            fetch = (alternatives.alternatives.__getitem__
+                     if not columnar else alternatives.__getitem__)
+
         for destination, count in self.demand.items():
             # Filter alternatives that match the destination
-            destination_alternatives = [alt for alt in alternatives
-                                        if alt.destination == destination
-                                        and not alt.mode in modes_unavailable]
-
-            if not destination_alternatives:
-                raise ValueError(f"No alternative found for destination: {destination}")
+            if bucketed:
+                destination_alternatives = [
+                    alt for alt in alternatives.get(destination, [])
+                    if alt.mode not in unavailable]
+                if not destination_alternatives:
+                    raise ValueError(f"No alternative found for destination: {destination}")
+            else:
+                idx = alternatives.candidates(destination, modes_unavailable)
+                if not idx.size:
+                    raise ValueError(f"No alternative found for destination: {destination}")
+                destination_alternatives = None
 
             # Select trips from available alternatives based on the given method
             if method == 'random':
-                selected_alternatives = random.choices(
-                    destination_alternatives, k=count)
+                # Draw all choices with replacement in one call; the same
+                # semantics as random.choices but without a Python-level loop
+                if bucketed:
+                    indices = _rng.integers(0, len(destination_alternatives),
+                                            size=count)
+                    selected_alternatives = [destination_alternatives[i]
+                                             for i in indices.tolist()]
+                else:
+                    # Positions come straight from the candidate array, so only
+                    # the selected alternatives are fetched (for an
+                    # AlternativeArray: materialized)
+                    selected_alternatives = [
+                        fetch(i)
+                        for i in _rng.choice(idx, size=count).tolist()]
             elif method == 'min_energy_typ_time':
+                if destination_alternatives is None:
+                    destination_alternatives = [fetch(i) for i in idx.tolist()]
                 selected_alternatives = self._select_min_energy_typ_time(
                     destination_alternatives, count)
             else:
@@ -110,52 +150,75 @@ class Persona:
 
 
     def _select_min_energy_typ_time(self, alternatives: List['Alternative'], count: int):
-        raise NotImplementedError("Not yet implemented")
         """
-        Solves an optimization problem to select a given number of alternatives
-        from a set, minimizing total energy demand, while staying within bounds
-        of the typical travel time.
+        Select a given number of alternatives from a set, minimizing total
+        energy demand, while staying within bounds of the typical travel time.
+
+        Selection is with replacement, as for the 'random' method. The problem
+        is solved exactly with a dynamic program over travel time discretized
+        to 0.1 minute buckets, using vectorized numpy updates; for the small
+        instances arising here this runs in microseconds, where a MILP solver
+        would spend milliseconds on startup alone. If no selection lands within
+        10 minutes of the persona's typical travel time, the selection whose
+        total time is closest to it is returned, with energy demand as the
+        tie-breaker.
 
         Args:
-            alternatives : list of alternatives with 'time' and 'energy_demand'
-            count (int): Number of alternatives to choose from the set
+            alternatives (List[Alternative]): Alternatives with 'time' and
+                                              'energy_demand' to choose from.
+            count (int): Number of alternatives to choose from the set.
 
         Returns:
-            The optimal selection of alternatives with lowest energy demand
-            while in line with time requirements
+            List[Alternative]: The optimal selection of alternatives with
+            lowest energy demand while in line with time requirements.
 
         Notes:
         The function assumes that the total time and energy demand are linearly
         related to the selection of alternatives. If the relationship is more
         complex, the formulation of the problem may need adjustment.
         """
-        # Number of alternatives
-        n = len(alternatives)
-        # Coefficients for the objective function (minimize energy demand)
-        c = [alternative.energy_demand for alternative in alternatives]
-        # Inequality constraints matrix
-        A = [[alternative.time for alternative in alternatives]]
-        # Inequality constraints vector
-        b = [5, 10] # Total time should be between 5 and 10
-        # Equality constraints matrix
-        A_eq = [[1 for _ in range(n)]] # Sum of all alternatives should be equal to count
-        # Equality constraints vector
-        b_eq = [count]
-        # Bounds for the variables (0 <= x <= 1 for each alternative)
-        lb = [0 for _ in range(n)]
-        ub = [1 for _ in range(n)]
-        variable_bounds = Bounds(lb, ub)
-        # Constraints
-        constraints = LinearConstraint(A, -np.inf, b)
-        
-        # Solve the mixed-integer linear programming problem
-        res = milp(
-            c, 
-            integrality=[1 for _ in range(n)], # All variables are integers
-            bounds=variable_bounds,
-            constraints=constraints,
-            options={"disp": True}
-        )
-        
-        # Return the solution
-        return res
+        # Travel times in 0.1-minute buckets, and energy demands
+        times = np.array([round(alt.time * 10) for alt in alternatives],
+                         dtype=np.intp)
+        energies = np.array([alt.energy_demand for alt in alternatives],
+                            dtype=float)
+
+        # dp[k, t] is the minimal energy demand of k selections with total
+        # travel time t; choice[k, t] records the last alternative of that
+        # optimum, for reconstruction
+        t_max = int(times.max()) * count
+        dp = np.full((count + 1, t_max + 1), np.inf)
+        dp[0, 0] = 0.0
+        choice = np.zeros((count + 1, t_max + 1), dtype=np.intp)
+
+        for k in range(1, count + 1):
+            for i, (time, energy) in enumerate(zip(times, energies)):
+                # Vectorized update over all reachable total times at once
+                candidate = dp[k - 1, :t_max + 1 - time] + energy
+                better = candidate < dp[k, time:]
+                dp[k, time:][better] = candidate[better]
+                choice[k, time:][better] = i
+
+        # Candidate total times, preferring those within 10 minutes of the
+        # typical travel time
+        feasible = np.flatnonzero(np.isfinite(dp[count]))
+        lower = max(0, round((self.typ_travel_time - 10) * 10))
+        upper = min(t_max, round((self.typ_travel_time + 10) * 10))
+        in_bounds = feasible[(feasible >= lower) & (feasible <= upper)]
+
+        if in_bounds.size:
+            t = int(in_bounds[np.argmin(dp[count, in_bounds])])
+        else:
+            # No selection stays within bounds; take the closest total time,
+            # with energy demand as tie-breaker
+            deviation = np.abs(feasible / 10 - self.typ_travel_time)
+            t = int(feasible[np.lexsort((dp[count, feasible], deviation))[0]])
+
+        # Reconstruct the selection from the choice table
+        selected_alternatives = []
+        for k in range(count, 0, -1):
+            i = int(choice[k, t])
+            selected_alternatives.append(alternatives[i])
+            t -= int(times[i])
+
+        return selected_alternatives
@@ -4,17 +4,19 @@ As discussed at the 2024-12 writing retreat
 """
 
 from collections.abc import Collection
-from copy import copy
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import repeat
 from typing import Literal, Optional
 
+import numpy as np
+
 # Coded concepts
 Gender = Enum("Gender", "FLINT* male")
 Purpose = Enum("Purpose", "work leisure")
 
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     """A single/individual person.
 
@@ -36,11 +38,12 @@ class Person:
         # Currently this uses the first element in PERSONA.
         pa = PERSONA[0]
 
-        # Adopt the trip needs of this persona
-        self.trip_needs = copy(pa.trip_needs)
+        # Adopt the trip needs of this persona; a shallow copy suffices, since the
+        # keys and values are immutable
+        self.trip_needs = dict(pa.trip_needs)
 
 
-@dataclass
+@dataclass(slots=True)
 class Persona:
     """A ‘persona’: a set of personal characteristics shared by 1 or more people.
 
@@ -51,6 +54,9 @@ class Persona:
 
     gender: Gender
 
+    # Cached result of trip_needs; __slots__ precludes functools.cached_property
+    _needs: Optional[dict] = field(default=None, init=False, repr=False)
+
     def is_member(self, person: Person) -> bool:
         """Return :any:`True` if `person` is a member of this group."""
         return person.gender == self.gender
@@ -59,15 +65,19 @@ class Persona:
     def trip_needs(self) -> dict[Purpose, int]:
         """Decent mobility trip needs for all people in this persona.
 
+        Computed once per persona and cached; treat the result as read-only.
+
         .. todo:: Apply the logic from our shared spreadsheet.
         """
-        return {
-            Purpose["work"]: 4,
-            Purpose["leisure"]: 1,
-        }
+        if self._needs is None:
+            self._needs = {
+                Purpose["work"]: 4,
+                Purpose["leisure"]: 1,
+            }
+        return self._needs
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class POI:
     """A point of interest."""
 
@@ -75,7 +85,7 @@ class POI:
     needs_served: Purpose
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Trip:
     """A single trip."""
 
@@ -87,7 +97,7 @@ class Trip:
     destination: POI
 
 
-@dataclass
+@dataclass(slots=True)
 class TravelPlan:
     """A travel plan for a :class:`.Person`."""
 
@@ -97,11 +107,57 @@ class TravelPlan:
     #: Collection of trips that constitute the travel plan.
     trips: Collection[Trip] = field(default_factory=list)
 
+    # Structure-of-arrays view of trips; see _ensure_arrays().
+    _distances: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _times: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _purposes: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    # Cached count of trips by Purpose; see _ensure_counts().
+    _purpose_counts: Optional[dict] = field(default=None, init=False, repr=False)
+
     def __repr__(self) -> str:
         return (
             f"<Travel plan with {len(self.trips)} trips in {self.period_covered} days>"
         )
 
+    def invalidate(self) -> None:
+        """Discard cached arrays after :attr:`trips` changes."""
+        self._distances = self._times = self._purposes = None
+        self._purpose_counts = None
+
+    def _ensure_counts(self) -> None:
+        """Count the trips by :class:`Purpose` once, cached.
+
+        :func:`trip_count` then answers from the mapping instead of scanning the
+        trips again for every purpose.
+        """
+        if self._purpose_counts is None:
+            self._ensure_arrays()
+            bc = np.bincount(self._purposes, minlength=len(Purpose) + 1)
+            self._purpose_counts = {p: int(bc[p.value]) for p in Purpose}
+
+    def _ensure_arrays(self) -> None:
+        """Mirror :attr:`trips` in three parallel arrays, cached.
+
+        The arrays hold the distance and time of each trip as contiguous floats,
+        and the :class:`Purpose` of each destination as integer codes, so that the
+        utility functions below reduce with single numpy operations instead of
+        iterating :class:`Trip` objects.
+        """
+        if self._distances is None:
+            n = len(self.trips)
+            self._distances = np.fromiter(
+                (t.distance for t in self.trips), dtype=float, count=n
+            )
+            self._times = np.fromiter(
+                (t.time for t in self.trips), dtype=float, count=n
+            )
+            self._purposes = np.fromiter(
+                (t.destination.needs_served.value for t in self.trips),
+                dtype=np.int8,
+                count=n,
+            )
+
 
 #: A collection of personas.
 PERSONA = (
@@ -127,7 +183,8 @@ def travel_distance(
         the total. If "day", divide by :attr:`TravelPlan.period_covered` to give the
         travel distance per day. If "year", give the distance per year.
     """
-    d = sum(t.distance for t in tp.trips)
+    tp._ensure_arrays()
+    d = float(tp._distances.sum())
     t = {
         None: 1.0,
         "day": tp.period_covered,
@@ -138,12 +195,14 @@ def travel_distance(
 
 def travel_time(tp: TravelPlan) -> float:
     """Sum of the travel distance for trips `tp` [kilometre]."""
-    return sum(t.time for t in tp.trips)
+    tp._ensure_arrays()
+    return float(tp._times.sum())
 
 
 def trip_count(tp: TravelPlan, purpose: Purpose) -> int:
     """Count of trips for a certain `purpose`."""
-    return sum(map(lambda t: t.destination.needs_served == purpose, tp.trips))
+    tp._ensure_counts()
+    return tp._purpose_counts.get(purpose, 0)
 
 
 def has_decent_mobility(person: Person, tp: TravelPlan) -> bool:
@@ -171,6 +230,55 @@ def has_decent_mobility(person: Person, tp: TravelPlan) -> bool:
     return all(counts[p] >= needs[p] for p in Purpose) and (daily_time <= TIME_BUDGET)
 
 
+def has_decent_mobility_batch(
+    persons: Collection[Person], plans: Collection[TravelPlan]
+) -> np.ndarray:
+    """Apply the decent mobility criteria to aligned `persons` and `plans`.
+
+    Equivalent to ``[has_decent_mobility(pe, tp) for pe, tp in zip(persons, plans)]``
+    but vectorized: trip counts for all plans and purposes are accumulated into one
+    (N_plans, N_purposes) matrix with a single :func:`numpy.add.at` call, and both
+    criteria are evaluated with array comparisons instead of per-plan Python loops.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array with one entry per (person, plan) pair.
+    """
+    persons = list(persons)
+    plans = list(plans)
+    n_plan = len(plans)
+
+    if n_plan == 0:
+        return np.zeros(0, dtype=bool)
+
+    for tp in plans:
+        tp._ensure_arrays()
+
+    # Concatenated purpose codes and times for all trips in all plans, plus the
+    # index of the plan that owns each trip
+    purpose_code = np.concatenate([tp._purposes for tp in plans])
+    times = np.concatenate([tp._times for tp in plans])
+    plan_idx = np.repeat(
+        np.arange(n_plan), [len(tp.trips) for tp in plans]
+    )
+
+    # Count trips by (plan, purpose) in one shot; Purpose values are 1-based
+    counts = np.zeros((n_plan, len(Purpose)), dtype=np.int64)
+    np.add.at(counts, (plan_idx, purpose_code - 1), 1)
+
+    # Per-person trip needs as a matrix aligned with `counts`
+    needs = np.array(
+        [[pe.trip_needs.get(p, 0) for p in Purpose] for pe in persons]
+    )
+
+    # Travel time [hours / day] per plan
+    periods = np.fromiter((tp.period_covered for tp in plans), float, count=n_plan)
+    daily_time = np.bincount(plan_idx, weights=times, minlength=n_plan) / periods
+
+    return (counts >= needs).all(axis=1) & (daily_time <= TIME_BUDGET)
+
+
 def make_travel_plan(data: dict[Purpose, tuple[int, float, float]]) -> TravelPlan:
     """Construct a :class:`TravelPlan` using aggregate `data`.
 
@@ -193,7 +301,8 @@ def make_travel_plan(data: dict[Purpose, tuple[int, float, float]]) -> TravelPla
     for purpose, (count, distance, time) in data.items():
         poi = POI(needs_served=purpose)
         trip = Trip(distance, time, destination=poi)
-        trips.extend(copy(trip) for _ in range(count))
+        # Trip is frozen, so the `count` identical trips can share one instance
+        trips.extend(repeat(trip, count))
 
     return TravelPlan(trips=trips)
 
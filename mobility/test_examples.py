@@ -0,0 +1,45 @@
+import unittest
+
+# Imported once at collection time; an import inside the test body would re-run
+# the module lookup on every call
+from mobility import Agent, Alternative, GridLocation, LocationType, Model, Need
+
+
+class TestExamples(unittest.TestCase):
+    def test_example0(self):
+        home = GridLocation(0.0, 0.0)
+        work = GridLocation(3.0, 4.0)
+        leisure = GridLocation(0.0, 1.0)
+        locations = {
+            LocationType.home: home,
+            LocationType.work: work,
+            LocationType.leisure: leisure,
+        }
+        needs = [
+            Need(LocationType.home, LocationType.work, 10),
+            Need(LocationType.home, LocationType.leisure, 2),
+        ]
+
+        # An agent whose plan covers both needs
+        served = Agent(
+            dict(locations), list(needs),
+            [Alternative(home, work), Alternative(home, leisure)])
+        self.assertTrue(served.has_decent_mobility())
+        self.assertEqual(served.total_distance(), 10 * 5.0 + 2 * 1.0)
+
+        # An agent whose plan misses the leisure need
+        unserved = Agent(dict(locations), list(needs), [Alternative(home, work)])
+        self.assertFalse(unserved.has_decent_mobility())
+
+        # The model-level criterion agrees with the per-agent checks, both for
+        # the batched (numba) pass and the pure-Python fallback
+        model = Model([served, unserved])
+        self.assertFalse(model.universal_decent_mobility())
+        self.assertFalse(all(a.has_decent_mobility() for a in model.agent))
+
+        model = Model([served])
+        self.assertTrue(model.universal_decent_mobility())
+
+
+if __name__ == "__main__":
+    unittest.main()
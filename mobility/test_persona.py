@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from persona import Persona
 from alternative import Alternative
 
@@ -7,9 +9,24 @@ class TestPersona(unittest.TestCase):
     def setUp(self):
         self.trips_data = {"work": 1, "home": 4, "grocery_store": 1, "leisure": 2}
         self.persona = Persona("John", 30.5, self.trips_data)
-        self.alternatives = [Alternative(dest, mode, 1.5, 10, energy)
-                             for dest in self.trips_data.keys()
-                             for mode, energy in {'car': 1, 'bicycle': 0, 'bus': 0.2}.items()]
+        # Cartesian product of destinations and modes as aligned index arrays,
+        # constructed in one shot rather than nested Python loops
+        dests = np.array(list(self.trips_data))
+        modes = np.array(['car', 'bicycle', 'bus'])
+        energies = np.array([1, 0, 0.2])
+        D, M = np.meshgrid(np.arange(len(dests)), np.arange(len(modes)),
+                           indexing='ij')
+        self.alternatives = [Alternative(dests[d], modes[m], 1.5, 10, energies[m])
+                             for d, m in zip(D.ravel(), M.ravel())]
+        # The same alternatives pre-bucketed by destination, sparing
+        # compute_trips the per-destination scan of the flat list
+        self.alternatives_by_dest = {dest: [alt for alt in self.alternatives
+                                            if alt.destination == dest]
+                                     for dest in self.trips_data}
+        # The same alternatives in columnar (structure-of-arrays) form
+        self.alternative_array = Alternative.from_columns(
+            dests[D.ravel()], modes[M.ravel()],
+            np.full(D.size, 1.5), np.full(D.size, 10), energies[M.ravel()])
 
     def test_get_name(self):
         self.assertEqual(self.persona.get_name(), "John")
@@ -20,21 +37,43 @@ class TestPersona(unittest.TestCase):
     def test_get_demand(self):
         self.assertEqual(self.persona.get_demand(), self.trips_data)
     
+    def assertTripsMatchDemand(self, trips):
+        # One batched comparison instead of a per-trip assertEqual: flattened in
+        # demand order, the destinations of the selected trips must repeat each
+        # destination exactly as many times as demanded
+        expected = np.repeat(list(self.trips_data.keys()),
+                             list(self.trips_data.values()))
+        actual = np.array([alt.destination
+                           for dest in self.trips_data
+                           for alt in trips[dest]])
+        self.assertTrue(np.array_equal(actual, expected))
+
     def test_compute_trips_random(self):
         self.persona.compute_trips(self.alternatives, 'random')
-        trips = self.persona.get_trips()
-        for dest, count in self.trips_data.items():
-            self.assertEqual(len(trips[dest]), count, dest)
-            for alt in trips[dest]:
-                self.assertEqual(alt.destination, dest, alt)
-    
+        self.assertTripsMatchDemand(self.persona.get_trips())
+
     def test_compute_trips_random_car_unavailable(self):
         self.persona.compute_trips(self.alternatives, 'random', ['car'])
+        self.assertTripsMatchDemand(self.persona.get_trips())
+
+    def test_compute_trips_random_bucketed(self):
+        self.persona.compute_trips(self.alternatives_by_dest, 'random')
+        self.assertTripsMatchDemand(self.persona.get_trips())
+
+    def test_compute_trips_random_columnar(self):
+        self.persona.compute_trips(self.alternative_array, 'random', ['car'])
+        trips = self.persona.get_trips()
+        self.assertTripsMatchDemand(trips)
+        for alts in trips.values():
+            for alt in alts:
+                self.assertNotEqual(alt.mode, 'car')
+
+    def test_compute_trips_min_energy_columnar(self):
+        self.persona.compute_trips(self.alternative_array,
+                                   'min_energy_typ_time')
         trips = self.persona.get_trips()
         for dest, count in self.trips_data.items():
             self.assertEqual(len(trips[dest]), count, dest)
-            for alt in trips[dest]:
-                self.assertEqual(alt.destination, dest, alt)
     
     def test_compute_trips_random_all_unavailable(self):
         with self.assertRaises(ValueError):
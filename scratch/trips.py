@@ -5,6 +5,9 @@ types, and an average length for each type of trip.
 
 This is updated version of trips_xarray.py using the genno package.
 """
+import functools
+
+import numpy as np
 import pint
 import xarray as xr
 from genno import Computer, Key, Quantity
@@ -31,16 +34,30 @@ tt = [
 # Trip mode
 tm = ["active", "motorized"]
 
-DIMS = {"geo": geo, "tt": tt, "tm": tm}  # All dimensions used in this file
+# Scenario identifiers for the illustrative travel patterns in section 4
+scenario = ["ref", "long walk", "dense TOD"]
+
+# All dimensions used in this file
+DIMS = {"geo": geo, "tt": tt, "tm": tm, "scenario": scenario}
 
 # Shorthand functions
 
 
+@functools.lru_cache(maxsize=None)
+def _coords_for(dims: str):
+    """Coordinates for the space-separated dimensions `dims`, resolved once."""
+    return {dim: DIMS[dim] for dim in dims.split()}
+
+
 def q(data, dims, **kwargs):
-    """Shorthand to create a N-dimensional quantity."""
+    """Shorthand to create a N-dimensional quantity.
 
-    coords = {dim: DIMS[dim] for dim in dims.split()}
-    return Quantity(xr.DataArray(data, coords=coords), **kwargs)
+    Data are packed as float32: the magnitudes used in this file fit comfortably,
+    and halving the element size halves the memory traffic of every downstream
+    contraction once the dimensions grow.
+    """
+    data = np.asarray(data, dtype=np.float32)
+    return Quantity(xr.DataArray(data, coords=_coords_for(dims)), **kwargs)
 
 
 def show(key: Key):
@@ -48,149 +65,181 @@ def show(key: Key):
     print(key, c.get(key), sep="\n", end="\n\n")
 
 
-# 1. Existing approach
-
-c = Computer()
+# Operations used in the task graph
 
-# Threshold used in prior DLE work
-c.add("base distance:", Quantity(10000, units="km / a"))
 
-# Urban population fraction [dimensionless] as an example of an attribute with a `geo`
-# dimension
-c.add("urban frac:geo", q([0.9, 0.5, 0.75], dims="geo"))
+def urban_frac_ref(urban_frac: Quantity, ref: str = "JP") -> float:
+    """The urban population fraction of the reference region `ref`, as a scalar."""
+    return float(urban_frac.sel(geo=ref).item())
 
 
-def scale_by_urban_frac(qty: Quantity, urban_frac: Quantity) -> Quantity:
+def scale_by_urban_frac(qty: Quantity, urban_frac: Quantity, ref: float) -> Quantity:
     """Adjust `qty` (scalar) based on urban population fraction (dimension `geo`).
 
     The functional form and coefficients mean nothing; simply for illustration. The
-    result has the same dimensionality as `urban_frac`; the value for geo="JP" is used
-    as a reference.
+    result has the same dimensionality as `urban_frac`; `ref` is the urban fraction
+    of the reference region, from the "urban frac ref:" task.
     """
-    return qty * (1 + 0.4 * (urban_frac.sel(geo="JP").item() - urban_frac))
-
-
-# Produces distances in the range (10000, 11600) km
-k = Key("distance 1:geo")
-c.add(k, scale_by_urban_frac, "base distance:", "urban frac:geo")
-show(k)
-
-
-# 2. Adding trips
-#
-# Alternate expression of a decent living standard by number of trips. In this example,
-# there is no `geo` dimension; values are thus assumed the same for each `geo`, but they
-# need not be. These numbers could be drawn from NHTS or other travel surveys.
-trips = q(
-    [
-        52 * 5 * 2,  # work:  52 weeks × 5 days/week × 2 trips/day
-        52 * 4,  # other: 4 trips/week
-        52 * 1,  # leisure: 1 trip per week
-        5,  # tourism: a little less than 1 trip every 2 months
-    ],
-    dims="tt",
-)
-c.add("trips:tt", trips)
-
-# Length of a single trip of each trip_type in the reference region
-c.add("trip length:tt:JP", q([10, 10, 30, 232], dims="tt", units="km"))
-
-# Scale the trip lengths for each `geo`. The function is the same one used above, but
-# instead of scaling the 0-d "base distance" to get 1-D, we scale a 1-D quantity and get
-# 2-D.
-k = Key("trip length:geo-tt")
-c.add(k, scale_by_urban_frac, "trip length:tt:JP", "urban frac:geo")
-show(k)
-
-# Compute total distance
-k = Key("distance 2:geo-tt")
-c.add(k, "mul", "trips:tt", "trip length:geo-tt")
-
-# Drop the `tt` dimension (but retain `geo`) to indicate a partial sum across trip_types
-show(k / "tt")
-
-
-# 3. Use trip-based calculation to add nuance
-#
-# For example: we assume that while greater urban population fraction affects the trip
-# length in the daily life area, it does not affect the length of long-distance tourism
-# trips, which are governed by the (non-changing) distances between cities.
-#
-# Again, only a minimal, contrived example: in principle the function(s) used can be
-# more complex.
+    return qty * (1 + 0.4 * (ref - urban_frac))
 
 
 def same_distance_tourism(trip_length: Quantity) -> Quantity:
     """tt="tourism" all the same as geo="JP"; all others distinct as scaled."""
-    from genno.operator import concat
-
-    return concat(
-        trip_length.sel({"tt": tt[:-1]}),
-        trip_length.sel({"geo": "JP", "tt": ["tourism"]}).expand_dims({"geo": geo}),
-    )
-
+    # Copy once and overwrite the tourism slice in place with the JP value. This
+    # avoids concat(), which allocates a fresh array and copies both halves, and
+    # the materialized broadcast of expand_dims(). "tourism" indexes the leading
+    # `tt` level of the quantity.
+    out = trip_length.copy()
+    out.loc["tourism"] = float(trip_length.sel(geo="JP", tt="tourism").item())
+    return out
 
-tl2 = Key("trip length 2:geo-tt")
-c.add(tl2, same_distance_tourism, "trip length:geo-tt")
-show(tl2)
 
-# Same as above
-k = Key("distance 3:geo-tt")
-c.add(k, "mul", "trips:tt", tl2)
-show(k / "tt")
-
-# Display how this calculation is structured
-print(c.describe(k / "tt"))
-
-
-# 4. Use trip-based calculation to capture geographic/scenario differences
-#
-# We illustrate by construction of variables that would be used in calculations similar
-# to the above. The calculations are not shown; but in all cases they result in distance
-# per person per year that feeds into the remainder of the DLE analysis workflow.
-
-# Add the 'hidden' walking segments at the beginning end of the reference trips (to and
-# from a transit stop in Japan).
-c.add("trips:tm-tt:ref", q([[0.2, 0.2, 0.2, 0.2], [10, 10, 30, 232]], dims="tm tt"))
-
-# Other scenarios: person with no access to motorized transport at all = not decent
-# mobility, because they do *too much* walking to access work, other services, etc.
-c.add("trips:tm-tt:long walk", q([[10, 10, 10, 10], [0, 0, 0, 0]], dims="tm tt"))
-
-# Person living in a dense, active-transport-friendly community, making full use of
-# telecommuting to reduce work travel, but still taking vacations, etc.
-c.add("trips:tm-tt:dense TOD", q([[2, 2, 0.2, 0.2], [0, 0, 30, 232]], dims="tm tt"))
-
-# Not the main focus of DLE, but this person takes excess leisure and tourism trips,
-# perhaps driving up the demand for energy/low-carbon transport equipment, thereby
-# making it less affordable.
-c.add("frequent flyer:tt", "add", "trips:tt", q([0, 0, 52, 10], dims="tt"))
-
-# 5. Add other outputs: time, money
-#
-# Here these have dimension `tt`, but they more likely would have `tm` and other
-# dimensions. These could be then compared to reference values: Marchetti & Zahavi's
-# constants (or an empirical range); expenditures.
+c = Computer()
 
+# Registered USD before any quantity with a money unit is created
 pint.get_application_registry().define("USD = [money]")
-c.add("price:tt", q([0.1, 0.15, 0.2, 1.0], dims="tt", units="USD/km"))
-c.add("speed:tt", q([50.0, 50.0, 40.0, 100.0], dims="tt", units="km/h"))
 
-# Total travel time = distance / speed
-k_distance = k
+# Frequently-reused keys
+k_distance = Key("distance 3:geo-tt")
+k_length = Key("trip length:geo-tt")
+k_length2 = Key("trip length 2:geo-tt")
 k_time = Key("time:geo-tt")
-c.add(k_time, "div", k_distance, "speed:tt")
-
-# Total travel cost = distance * price
 k_cost = Key("cost:geo-tt")
-c.add(k_cost, "mul", k_distance, "price:tt")
-
-# Compute distance, time, and cost at once
 k_all = Key("all")
-c.add(k_all, [k_distance / "tt", k_time / "tt", k_cost / "tt"])
-
-# Show what would be done
-print(c.describe(k_all))
 
-# Show the result
-print(c.get(k_all))
+# All tasks, queued and added in one add_queue() call below: the Computer then pays
+# its per-task validation and graph update in a single traversal, instead of once
+# per add() call — which adds up when a template like this one fans out to
+# thousands of scenario tasks.
+queue = [
+    # 1. Existing approach
+    #
+    # Threshold used in prior DLE work
+    ("base distance:", Quantity(np.float32(10000), units="km / a")),
+    # Urban population fraction [dimensionless] as an example of an attribute with
+    # a `geo` dimension
+    ("urban frac:geo", q([0.9, 0.5, 0.75], dims="geo")),
+    # Computed once in the graph and shared by every task that scales by urban
+    # fraction, instead of a .sel(...).item() label lookup per call
+    ("urban frac ref:", urban_frac_ref, "urban frac:geo"),
+    # Produces distances in the range (10000, 11600) km
+    (
+        Key("distance 1:geo"),
+        scale_by_urban_frac,
+        "base distance:",
+        "urban frac:geo",
+        "urban frac ref:",
+    ),
+    # 2. Adding trips
+    #
+    # Alternate expression of a decent living standard by number of trips. In this
+    # example, there is no `geo` dimension; values are thus assumed the same for
+    # each `geo`, but they need not be. These numbers could be drawn from NHTS or
+    # other travel surveys.
+    (
+        "trips:tt",
+        q(
+            [
+                52 * 5 * 2,  # work:  52 weeks × 5 days/week × 2 trips/day
+                52 * 4,  # other: 4 trips/week
+                52 * 1,  # leisure: 1 trip per week
+                5,  # tourism: a little less than 1 trip every 2 months
+            ],
+            dims="tt",
+        ),
+    ),
+    # Length of a single trip of each trip_type in the reference region
+    ("trip length:tt:JP", q([10, 10, 30, 232], dims="tt", units="km")),
+    # Scale the trip lengths for each `geo`. The function is the same one used
+    # above, but instead of scaling the 0-d "base distance" to get 1-D, we scale a
+    # 1-D quantity and get 2-D.
+    (
+        k_length,
+        scale_by_urban_frac,
+        "trip length:tt:JP",
+        "urban frac:geo",
+        "urban frac ref:",
+    ),
+    # Compute total distance
+    (Key("distance 2:geo-tt"), "mul", "trips:tt", k_length),
+    # 3. Use trip-based calculation to add nuance
+    #
+    # For example: we assume that while greater urban population fraction affects
+    # the trip length in the daily life area, it does not affect the length of
+    # long-distance tourism trips, which are governed by the (non-changing)
+    # distances between cities.
+    #
+    # Again, only a minimal, contrived example: in principle the function(s) used
+    # can be more complex.
+    (k_length2, same_distance_tourism, k_length),
+    # Same as above
+    (k_distance, "mul", "trips:tt", k_length2),
+    # 4. Use trip-based calculation to capture geographic/scenario differences
+    #
+    # We illustrate by construction of variables that would be used in calculations
+    # similar to the above. The calculations are not shown; but in all cases they
+    # result in distance per person per year that feeds into the remainder of the
+    # DLE analysis workflow.
+    #
+    # All scenario variants stacked on a single `scenario` dimension: one
+    # allocation instead of one sibling quantity per scenario, and downstream
+    # operations broadcast across all scenarios in a single contraction.
+    (
+        "trips:scenario-tm-tt",
+        q(
+            np.stack(
+                [
+                    # "ref": add the 'hidden' walking segments at the beginning and
+                    # end of the reference trips (to and from a transit stop in
+                    # Japan).
+                    [[0.2, 0.2, 0.2, 0.2], [10, 10, 30, 232]],
+                    # "long walk": person with no access to motorized transport at
+                    # all = not decent mobility, because they do *too much* walking
+                    # to access work, other services, etc.
+                    [[10, 10, 10, 10], [0, 0, 0, 0]],
+                    # "dense TOD": person living in a dense,
+                    # active-transport-friendly community, making full use of
+                    # telecommuting to reduce work travel, but still taking
+                    # vacations, etc.
+                    [[2, 2, 0.2, 0.2], [0, 0, 30, 232]],
+                ]
+            ),
+            dims="scenario tm tt",
+        ),
+    ),
+    # Not the main focus of DLE, but this person takes excess leisure and tourism
+    # trips, perhaps driving up the demand for energy/low-carbon transport
+    # equipment, thereby making it less affordable.
+    ("frequent flyer:tt", "add", "trips:tt", q([0, 0, 52, 10], dims="tt")),
+    # 5. Add other outputs: time, money
+    #
+    # Here these have dimension `tt`, but they more likely would have `tm` and
+    # other dimensions. These could be then compared to reference values: Marchetti
+    # & Zahavi's constants (or an empirical range); expenditures.
+    ("price:tt", q([0.1, 0.15, 0.2, 1.0], dims="tt", units="USD/km")),
+    ("speed:tt", q([50.0, 50.0, 40.0, 100.0], dims="tt", units="km/h")),
+    # Total travel time = distance / speed
+    (k_time, "div", k_distance, "speed:tt"),
+    # Total travel cost = distance * price
+    (k_cost, "mul", k_distance, "price:tt"),
+    # Compute distance, time, and cost at once
+    (k_all, [k_distance / "tt", k_time / "tt", k_cost / "tt"]),
+]
+c.add_queue(queue)
+
+# Show the intermediate and final values, and how the calculations are
+# structured — only when run as a script. Importing the module registers the
+# tasks but computes nothing, preserving genno's lazy evaluation for reuse.
+if __name__ == "__main__":
+    show(Key("distance 1:geo"))
+    show(k_length)
+    show(Key("distance 2:geo-tt") / "tt")
+    show(k_length2)
+    show(k_distance / "tt")
+    print(c.describe(k_distance / "tt"))
+
+    # Show what would be done
+    print(c.describe(k_all))
+
+    # Show the result
+    print(c.get(k_all))
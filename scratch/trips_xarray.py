@@ -9,68 +9,129 @@ updated version using genno.
 """
 
 
+import functools
+
+import numpy as np
 import xarray as xr
 
 # 1. Existing approach ---
 
-# Some regions
-ds = xr.Dataset()
-ds["region"] = ["JP", "BR", "IN"]
-
-# Urban population fraction [0] as an example of a region attribute
-ds["urban frac"] = xr.DataArray([0.9, 0.5, 0.75], dims="region")
+# Input variables, constructed in one batch: each incremental `ds[name] = ...`
+# assignment re-runs coordinate alignment and index validation, so the constructor
+# pays those costs once for all variables
+ds = xr.Dataset(
+    {
+        # Urban population fraction [0] as an example of a region attribute
+        "urban frac": ("region", [0.9, 0.5, 0.75]),
+        # Current decent mobility standard
+        "base distance": 10000,  # [motorized passenger-kilometres / year]
+    },
+    # Some regions
+    coords={"region": ["JP", "BR", "IN"]},
+)
 
-# Current decent mobility standard
-ds["base distance"] = 10000  # [motorized passenger-kilometres / year]
+# Urban fractions as a contiguous array and the position of the reference region,
+# both resolved once; scale_by_urban_frac then works on plain NumPy values without
+# xarray's per-call label lookup and coordinate alignment
+urban_np = ds["urban frac"].values
+jp_idx = list(ds["region"].values).index("JP")
 
 
-def scale_by_urban_frac(var):
-    """Adjust *var* based on urban population fraction.
+def _scale_core(values, urban_frac, ref_idx, coeff):
+    """Adjust *values* based on *urban_frac*, the urban population fraction.
 
     Functional form and coefficients mean nothing; simply for illustration.
+
+    *values* is a plain scalar or ndarray (without a region dimension); the result
+    is an ndarray with a leading region axis. *ref_idx* is the position of the
+    reference region in *urban_frac* and *coeff* the scaling coefficient.
     """
-    return var * (1 + 0.4 * (ds["urban frac"].loc["JP"] - ds["urban frac"]))
+    return np.multiply.outer(1 + coeff * (urban_frac[ref_idx] - urban_frac), values)
+
+
+# The model constants bound once at import: calls pass only *values*, and the
+# constants arrive as pre-bound locals rather than module-global lookups on every
+# call
+scale_by_urban_frac = functools.partial(
+    _scale_core, urban_frac=urban_np, ref_idx=jp_idx, coeff=0.4
+)
 
 
 # Produces distances in the range (10000, 11600) km
-ds["distance 1"] = scale_by_urban_frac(ds["base distance"])
+ds["distance 1"] = xr.DataArray(
+    scale_by_urban_frac(ds["base distance"].values), dims="region"
+)
 print(ds["distance 1"])
 
 
 # 2. Adding trips
 
-# Trip categories
-ds["trip_type"] = [
-    "work",
-    "other",  # to access shopping, services, etc.
-    "leisure",  # within the 'daily life area'
-    "tourism",  # long-distance leisure trips, outside of the 'daily life area'
-]
-
-# Decent living standard expressed as number of trips. Same for every region.
-# These numbers could be drawn from NHTS or other travel surveys.
-ds["trips"] = xr.DataArray(
-    [
-        52 * 5 * 2,  # work:  52 weeks × 5 days/week × 2 trips/day
-        52 * 4,  # other: 4 trips/week
-        52 * 1,  # leisure: 1 trip per week
-        5,  # tourism: a little less than 1 trip every 2 months
-    ],
-    dims="trip_type",
+# Trip variables, again batched into a single update rather than one aligned
+# assignment per variable
+ds.update(
+    xr.Dataset(
+        {
+            # Decent living standard expressed as number of trips. Same for every
+            # region. These numbers could be drawn from NHTS or other travel
+            # surveys.
+            "trips": (
+                "trip_type",
+                [
+                    52 * 5 * 2,  # work:  52 weeks × 5 days/week × 2 trips/day
+                    52 * 4,  # other: 4 trips/week
+                    52 * 1,  # leisure: 1 trip per week
+                    5,  # tourism: a little less than 1 trip every 2 months
+                ],
+            ),
+            # Empty variable (all zeroes) for trip distances [kilometres / trip]
+            "trip length": (
+                ("region", "trip_type"),
+                np.zeros((len(ds["region"]), 4), dtype=np.float64),
+            ),
+        },
+        # Trip categories
+        coords={
+            "trip_type": [
+                "work",
+                "other",  # to access shopping, services, etc.
+                "leisure",  # within the 'daily life area'
+                "tourism",  # long-distance leisure trips, outside the 'daily life area'
+            ]
+        },
+    )
 )
 
-# Empty variable (all zeroes) for trip distances [kilometres / trip]
-ds["trip length"] = xr.DataArray([[0.0] * 4] * 3, dims=("region", "trip_type"))
+# Position of the tourism trip type, resolved once like jp_idx above; writes below
+# then go through plain positional ndarray assignment instead of xarray's
+# label-indexing machinery (hash lookup, alignment, dtype coercion per write)
+tourism_idx = list(ds["trip_type"].values).index("tourism")
 
 # Distances for the reference case
-ds["trip length"].loc["JP", :] = [10, 10, 30, 232]
+ds["trip length"].values[jp_idx, :] = np.array([10, 10, 30, 232], dtype=np.float64)
 
 # Scale the trip lengths by region—exactly the same method as above
-ds["trip length"] = scale_by_urban_frac(ds["trip length"].loc["JP", :])
+ds["trip length"] = xr.DataArray(
+    scale_by_urban_frac(ds["trip length"].values[jp_idx, :]),
+    dims=("region", "trip_type"),
+)
 print(ds["trip length"])
 
+def compute_distance(trips, length):
+    """Total distance per region: contract *trips* [trip_type] with *length*
+    [region, trip_type].
+
+    Fuses the product and the sum over trip types into one einsum contraction,
+    which dispatches to a tight SIMD-vectorized C loop without materializing the
+    full (region, trip_type) intermediate. Operands are plain ndarrays (pass the
+    ``.values`` views), skipping xarray's per-call alignment.
+    """
+    return np.einsum("t,rt->r", trips, length, optimize=True)
+
+
 # Compute the distances—same as above
-ds["distance 2"] = (ds["trips"] * ds["trip length"]).sum("trip_type")
+ds["distance 2"] = xr.DataArray(
+    compute_distance(ds["trips"].values, ds["trip length"].values), dims="region"
+)
 print(ds["distance 2"])
 
 
@@ -81,11 +142,14 @@ print(ds["distance 2"])
 # are governed by the (non-changing) distances between cities.
 
 # Long-distance trips all the same length; others remain as scaled above
-idx = dict(region="JP", trip_type="tourism")
-ds["trip length"].loc[dict(trip_type="tourism")] = ds["trip length"].loc[idx]
+ds["trip length"].values[:, tourism_idx] = ds["trip length"].values[
+    jp_idx, tourism_idx
+]
 
 # Compute distances; slightly smaller range than above
-ds["distance 3"] = (ds["trips"] * ds["trip length"]).sum("trip_type")
+ds["distance 3"] = xr.DataArray(
+    compute_distance(ds["trips"].values, ds["trip length"].values), dims="region"
+)
 print(ds["distance 3"])
 
 
@@ -96,16 +160,25 @@ print(ds["distance 3"])
 # per person per year that feeds into the remainder of the DLE analysis workflow.
 
 # Add the 'hidden' walking segments at the beginning end of the reference trips (to and
-# from a transit stop in Japan).
-ds["trip_mode"] = ["active", "motorized"]
-ds["reference"] = xr.DataArray(
-    [[0.2, 0.2, 0.2, 0.2], [10, 10, 30, 232]], dims=("trip_mode", "trip_type")
-)
-
-# Other scenarios: person with no access to motorized transport at all = not decent
-# mobility, because they do *too much* walking to access work, other services, etc.
-ds["long walk"] = xr.DataArray(
-    [[10, 10, 10, 10], [0, 0, 0, 0]], dims=("trip_mode", "trip_type")
+# from a transit stop in Japan). One batched update for the scenario variables, as for
+# the input sections above.
+ds.update(
+    xr.Dataset(
+        {
+            "reference": (
+                ("trip_mode", "trip_type"),
+                [[0.2, 0.2, 0.2, 0.2], [10, 10, 30, 232]],
+            ),
+            # Other scenarios: person with no access to motorized transport at all
+            # = not decent mobility, because they do *too much* walking to access
+            # work, other services, etc.
+            "long walk": (
+                ("trip_mode", "trip_type"),
+                [[10, 10, 10, 10], [0, 0, 0, 0]],
+            ),
+        },
+        coords={"trip_mode": ["active", "motorized"]},
+    )
 )
 
 # Person living in a dense, active-transport-friendly community, making full use of